@@ -11,6 +11,10 @@ Features:
 import os
 import logging
 import random
+import shutil
+import hashlib
+import threading
+import uuid
 from typing import Optional
 from pathlib import Path
 from google.cloud import texttospeech
@@ -25,6 +29,9 @@ logger = logging.getLogger(__name__)
 class AudioGenerator:
     """Generate voiceovers with MULTIPLE Neural2 voices for variety."""
 
+    # Synthesized clips kept in the voiceover cache (least recently used go first)
+    MAX_CACHE_FILES = 200
+
     # VOICE VARIETY - 20 Most Popular Instagram Voices (10 Female, 10 Male)
     VOICES = {
         # TOP 10 FEMALE VOICES (Instagram favorites)
@@ -150,6 +157,14 @@ class AudioGenerator:
         """Initialize audio generator with Google Cloud Neural2."""
         # Google Cloud credentials from environment
         self.client = texttospeech.TextToSpeechClient()
+
+        # Content-addressed cache of synthesized clips (same text + voice = same audio)
+        self.cache_dir = Path("output/audio/.cache")
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Clip count is tracked in memory so the directory is only scanned
+        # when a write pushes it over MAX_CACHE_FILES
+        self._cache_lock = threading.Lock()
+        self._cache_count = sum(1 for f in self.cache_dir.iterdir() if f.suffix != ".tmp")
         
         logger.info("AudioGenerator initialized with 19 Neural2 voices (9 female, 10 male)")
         logger.info("Voices rotate automatically for maximum variety")
@@ -168,7 +183,7 @@ class AudioGenerator:
         
         Args:
             text: Text to convert to speech
-            output_path: Path to save MP3 file
+            output_path: Path to save audio file (.wav = uncompressed LINEAR16, otherwise MP3)
             speed_factor: Speed multiplier (1.0 = normal, 1.15 = 15% faster)
             voice_key: Specific voice to use (or None for random)
         
@@ -196,9 +211,31 @@ class AudioGenerator:
             # Prepare synthesis input
             synthesis_input = texttospeech.SynthesisInput(text=text)
             
+            # WAV output skips the MP3 encode/decode for in-pipeline handoff
+            if Path(output_path).suffix.lower() == ".wav":
+                audio_encoding = texttospeech.AudioEncoding.LINEAR16
+            else:
+                audio_encoding = texttospeech.AudioEncoding.MP3
+
+            output_path = Path(output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+
+            # Reuse a previous synthesis of the exact same request
+            cache_key = hashlib.sha256(
+                f"{text}|{voice_config['name']}|{voice_config['pitch']}|{speed_factor}|{audio_encoding.name}".encode()
+            ).hexdigest()
+            cached = self.cache_dir / f"{cache_key}{output_path.suffix}"
+            try:
+                shutil.copyfile(cached, output_path)
+                os.utime(cached)  # mark as recently used for _cleanup_cache
+                logger.info(f"✅ Voiceover from cache: {output_path}")
+                return str(output_path)
+            except FileNotFoundError:
+                pass  # not cached (or just pruned by another run) - synthesize
+
             # Audio config with speed and pitch
             audio_config = texttospeech.AudioConfig(
-                audio_encoding=texttospeech.AudioEncoding.MP3,
+                audio_encoding=audio_encoding,
                 speaking_rate=speed_factor,
                 pitch=voice_config["pitch"],
                 effects_profile_id=["small-bluetooth-speaker-class-device"]
@@ -212,11 +249,23 @@ class AudioGenerator:
             )
             
             # Save to file
-            output_path = Path(output_path)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
             with open(output_path, "wb") as out:
                 out.write(response.audio_content)
+
+            # Write under a unique name and rename, so a concurrent run never
+            # copies a half-written clip out of the cache
+            temp_path = self.cache_dir / f"{cache_key}.{uuid.uuid4().hex[:8]}.tmp"
+            try:
+                with open(temp_path, "wb") as out:
+                    out.write(response.audio_content)
+                os.replace(temp_path, cached)
+                with self._cache_lock:
+                    self._cache_count += 1
+                    if self._cache_count > self.MAX_CACHE_FILES:
+                        self._cleanup_cache()
+            except OSError as e:
+                temp_path.unlink(missing_ok=True)
+                logger.warning(f"Could not cache voiceover: {e}")
             
             logger.info(f"✅ Neural2 voiceover saved: {output_path}")
             return str(output_path)
@@ -225,6 +274,32 @@ class AudioGenerator:
             logger.error(f"Voiceover generation failed: {e}")
             raise
 
+    def _cleanup_cache(self):
+        """Remove the least recently used clips if the cache is too large (call with _cache_lock held)."""
+        def last_used(path: Path) -> float:
+            try:
+                return path.stat().st_mtime
+            except FileNotFoundError:
+                return 0.0  # already removed by another process
+
+        try:
+            cached_files = sorted(
+                (f for f in self.cache_dir.iterdir() if f.suffix != ".tmp"),
+                key=last_used
+            )
+
+            if len(cached_files) > self.MAX_CACHE_FILES:
+                files_to_remove = cached_files[:-self.MAX_CACHE_FILES]
+                for old_file in files_to_remove:
+                    old_file.unlink(missing_ok=True)
+
+                logger.info(f"Voiceover cache cleanup: removed {len(files_to_remove)} old files")
+
+            self._cache_count = min(len(cached_files), self.MAX_CACHE_FILES)
+
+        except Exception as e:
+            logger.error(f"Voiceover cache cleanup failed: {e}")
+
     def get_random_voice_key(self) -> str:
         """Get random voice key for variety."""
         return random.choice(list(self.VOICES.keys()))
@@ -542,21 +542,27 @@ class BackgroundManager:
         return None
 
     def _cleanup_cache(self):
-        """Remove old videos if cache is too large."""
+        """Remove old videos (and their normalized 1080x1920 copies) if the cache is too large."""
         if not self.cache_dir:
             return
 
         try:
             max_size = self.config.get("max_cache_size", 50)
-            cached_files = sorted(
-                self.cache_dir.glob("*.mp4"),
-                key=lambda x: x.stat().st_mtime
-            )
-
-            if len(cached_files) > max_size:
+            # Normalized copies are written by VideoGenerator; in-progress
+            # *.partial.mp4 files belong to a running reel and are left alone
+            cache_sets = [
+                list(self.cache_dir.glob("*.mp4")),
+                [f for f in (self.cache_dir / "normalized").glob("bg_*.mp4")
+                 if not f.name.endswith(".partial.mp4")],
+            ]
+
+            for files in cache_sets:
+                if len(files) <= max_size:
+                    continue
+                cached_files = sorted(files, key=lambda x: x.stat().st_mtime)
                 files_to_remove = cached_files[:-max_size]
                 for old_file in files_to_remove:
-                    old_file.unlink()
+                    old_file.unlink(missing_ok=True)
                     logger.info(f"Removed old cache file: {old_file.name}")
 
                 logger.info(f"Cache cleanup: removed {len(files_to_remove)} old files")
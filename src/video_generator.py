@@ -14,10 +14,19 @@ NO MORE REPETITION!
 """
 
 import os
+import atexit
 import json
+import math
 import logging
 import random
+import functools
 import hashlib
+import subprocess
+import tempfile
+import threading
+import uuid
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Optional, Tuple, List
 from pathlib import Path
@@ -26,9 +35,12 @@ from PIL import Image, ImageDraw, ImageFont
 import numpy as np
 
 try:
-    from moviepy import ImageClip, AudioFileClip, CompositeVideoClip, VideoFileClip, concatenate_videoclips
+    from moviepy import ImageClip, VideoClip, CompositeVideoClip, VideoFileClip, concatenate_videoclips, vfx
+    from moviepy.config import FFMPEG_BINARY
 except ImportError:
-    from moviepy.editor import ImageClip, AudioFileClip, CompositeVideoClip, VideoFileClip, concatenate_videoclips
+    from moviepy.editor import ImageClip, VideoClip, CompositeVideoClip, VideoFileClip, concatenate_videoclips, vfx
+    from moviepy.config import get_setting
+    FFMPEG_BINARY = get_setting("FFMPEG_BINARY")
 
 from pydub import AudioSegment
 from background_manager import BackgroundManager
@@ -41,57 +53,213 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=32)
+def _load_font(path_str: str, size: int) -> ImageFont.FreeTypeFont:
+    """Open a TrueType font once per (path, size) and reuse it for every overlay."""
+    return ImageFont.truetype(path_str, size)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_fallback_font(font_size: int) -> ImageFont.ImageFont:
+    """Resolve the DejaVu/system fallback font once per size."""
+    dejavu_paths = [
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+        "/System/Library/Fonts/Supplemental/Arial Bold.ttf",  # Mac
+        "C:\\Windows\\Fonts\\arialbd.ttf",  # Windows
+        Path(__file__).parent.parent / "fonts" / "DejaVuSans-Bold.ttf"
+    ]
+
+    for path in dejavu_paths:
+        try:
+            font = _load_font(str(path), font_size)
+            logger.info(f"Using fallback font: {path}")
+            return font
+        except Exception:
+            continue
+
+    # Last resort - load_default() but it's TINY
+    logger.error("No fonts available! Using tiny default font")
+    return ImageFont.load_default()
+
+
+def _pcm_args(seg: AudioSegment) -> List[str]:
+    """ffmpeg raw-PCM format options matching an AudioSegment's samples."""
+    pcm_format = {1: 'u8', 2: 's16le', 4: 's32le'}[seg.sample_width]
+    return ['-f', pcm_format, '-ar', str(seg.frame_rate), '-ac', str(seg.channels)]
+
+
+def _atempo(seg: AudioSegment, factor: float) -> AudioSegment:
+    """
+    Time-stretch audio with ffmpeg's atempo filter (pitch preserved).
+
+    Raw PCM is piped through a single ffmpeg process, which is far faster
+    than pydub's pure-Python speedup().
+    """
+    # atempo only accepts 0.5-2.0 per instance, so chain it for larger factors
+    filters = []
+    while factor > 2.0:
+        filters.append("atempo=2.0")
+        factor /= 2.0
+    while factor < 0.5:
+        filters.append("atempo=0.5")
+        factor /= 0.5
+    filters.append(f"atempo={factor:.6f}")
+
+    pcm_args = _pcm_args(seg)
+
+    result = subprocess.run(
+        [FFMPEG_BINARY, '-loglevel', 'error', *pcm_args, '-i', 'pipe:0',
+         '-filter:a', ','.join(filters), *pcm_args, 'pipe:1'],
+        input=seg.raw_data,
+        capture_output=True,
+        check=True
+    )
+
+    return AudioSegment(
+        data=result.stdout,
+        sample_width=seg.sample_width,
+        frame_rate=seg.frame_rate,
+        channels=seg.channels
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _hw_encoder_works(codec: str, preset: str) -> bool:
+    """
+    Check whether ffmpeg can actually encode with a hardware H.264 encoder.
+
+    Listing the encoder isn't enough (static builds ship NVENC/QSV/AMF
+    without the hardware), so encode one tiny frame with the same preset
+    the reel will use and see if it succeeds.
+    """
+    try:
+        result = subprocess.run(
+            [FFMPEG_BINARY, '-hide_banner', '-loglevel', 'error',
+             '-f', 'lavfi', '-i', 'color=s=256x256:d=0.1', '-frames:v', '1',
+             '-c:v', codec, '-preset', preset, '-f', 'null', '-'],
+            capture_output=True,
+            timeout=15
+        )
+        return result.returncode == 0
+    except Exception:
+        return False
+
+
+# Every live StyleHistory, flushed once at interpreter exit. Weak references
+# so a discarded generator (and its history) can still be garbage-collected.
+_live_histories: "weakref.WeakSet[StyleHistory]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_histories():
+    """Write pending history changes even if a reel failed midway."""
+    for history in list(_live_histories):
+        history.flush()
+
+
 class StyleHistory:
-    """Track used styles and backgrounds to avoid repetition."""
+    """
+    Track used styles and backgrounds to avoid repetition.
+
+    Safe to share between threads of one generator. Separate processes each
+    keep their own copy, so the last one to flush wins.
+    """
     
     def __init__(self, state_file: Path):
         self.state_file = state_file
         self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._dirty = False
         self.load()
+        # Make sure pending changes hit disk even if a reel fails midway
+        _live_histories.add(self)
     
     def load(self):
-        """Load history from file."""
-        if self.state_file.exists():
-            with open(self.state_file, 'r') as f:
-                data = json.load(f)
-                self.recent_styles = data.get('recent_styles', [])
-                self.recent_backgrounds = data.get('recent_backgrounds', [])
-        else:
+        """Load history from file (a missing or corrupt file starts fresh)."""
+        with self._lock:
             self.recent_styles = []
             self.recent_backgrounds = []
+            if self.state_file.exists():
+                try:
+                    with open(self.state_file, 'r') as f:
+                        data = json.load(f)
+                    self.recent_styles = data.get('recent_styles', [])
+                    self.recent_backgrounds = data.get('recent_backgrounds', [])
+                except (OSError, ValueError, AttributeError) as e:
+                    logger.warning(f"Style history unreadable ({e}), starting fresh")
     
     def save(self):
         """Save history to file."""
-        with open(self.state_file, 'w') as f:
-            json.dump({
-                'recent_styles': self.recent_styles,
-                'recent_backgrounds': self.recent_backgrounds
-            }, f, indent=2)
+        with self._lock:
+            # Write under a unique name and rename, so a reader (or a crash
+            # mid-write) never sees half a JSON file
+            temp_path = self.state_file.with_name(f"{self.state_file.name}.{uuid.uuid4().hex[:8]}.tmp")
+            try:
+                with open(temp_path, 'w') as f:
+                    json.dump({
+                        'recent_styles': self.recent_styles,
+                        'recent_backgrounds': self.recent_backgrounds
+                    }, f, indent=2)
+                os.replace(temp_path, self.state_file)
+            except Exception:
+                temp_path.unlink(missing_ok=True)
+                raise
+
+    def flush(self):
+        """Write history to file only if it changed since the last save."""
+        with self._lock:
+            if self._dirty:
+                self.save()
+                self._dirty = False
     
     def add_style(self, style_name: str, max_history: int = 2):
         """Add style to history, keeping only last N."""
-        if style_name in self.recent_styles:
-            self.recent_styles.remove(style_name)
-        self.recent_styles.insert(0, style_name)
-        self.recent_styles = self.recent_styles[:max_history]
-        self.save()
+        with self._lock:
+            if style_name in self.recent_styles:
+                self.recent_styles.remove(style_name)
+            self.recent_styles.insert(0, style_name)
+            self.recent_styles = self.recent_styles[:max_history]
+            self._dirty = True
     
     def add_background(self, bg_hash: str, max_history: int = 5):
         """Add background to history, keeping only last N."""
-        if bg_hash in self.recent_backgrounds:
-            self.recent_backgrounds.remove(bg_hash)
-        self.recent_backgrounds.insert(0, bg_hash)
-        self.recent_backgrounds = self.recent_backgrounds[:max_history]
-        self.save()
+        with self._lock:
+            if bg_hash in self.recent_backgrounds:
+                self.recent_backgrounds.remove(bg_hash)
+            self.recent_backgrounds.insert(0, bg_hash)
+            self.recent_backgrounds = self.recent_backgrounds[:max_history]
+            self._dirty = True
     
     def get_available_styles(self, all_styles: List[str]) -> List[str]:
         """Get styles that weren't recently used."""
-        available = [s for s in all_styles if s not in self.recent_styles]
+        with self._lock:
+            available = [s for s in all_styles if s not in self.recent_styles]
         return available if available else all_styles  # If all used, reset
     
     def should_avoid_background(self, bg_hash: str) -> bool:
         """Check if background was recently used."""
-        return bg_hash in self.recent_backgrounds
+        with self._lock:
+            return bg_hash in self.recent_backgrounds
+
+
+class PhotoSlideshow:
+    """
+    Photo slideshow background described by its cut list.
+
+    Holds (path, landscape) per photo rather than decoded frames; the
+    ffmpeg renderer reads the files itself and VideoGenerator builds a
+    MoviePy clip only when a frame-by-frame path needs one.
+    """
+
+    def __init__(self, photo_sources: List[Tuple[Path, bool]], photo_duration: float,
+                 duration: float, size: Tuple[int, int]):
+        self.photo_sources = photo_sources
+        self.photo_duration = photo_duration
+        self.duration = duration
+        self.size = size
+
+    def close(self):
+        """Nothing is held open (mirrors the MoviePy clip interface)."""
 
 
 class VideoGenerator:
@@ -102,6 +270,42 @@ class VideoGenerator:
     TARGET_DURATION_IDEAL = 18.0
     MAX_SPEED = 1.3
 
+    # Scene order drives TTS, audio concatenation and overlay timing
+    SCENE_ORDER = ("hook", "meaning", "action", "cta")
+
+    # Bump when overlay rendering changes so stale cached overlays are ignored
+    OVERLAY_CACHE_VERSION = "v1"
+    # Rendered overlays kept on disk (least recently used go first)
+    MAX_OVERLAY_CACHE_FILES = 500
+
+    # Hardware H.264 encoders tried in order before libx264: (codec, preset, extra params)
+    HW_ENCODERS = [
+        ('h264_nvenc', 'p5', ['-rc', 'vbr']),   # NVIDIA
+        ('h264_qsv', 'veryfast', []),          # Intel Quick Sync
+        ('h264_amf', 'speed', []),             # AMD
+    ]
+
+    # Background videos shorter than this are used as a single still frame
+    MIN_MOTION_BG_DURATION = 2.0
+
+    # Gradient fallback palettes (start, end)
+    GRADIENT_COLORS = [
+        ("#6B21A8", "#8B5CF6"),  # Purple
+        ("#1E40AF", "#3B82F6"),  # Blue
+        ("#BE123C", "#FB7185"),  # Pink
+        ("#4338CA", "#6366F1"),  # Indigo
+    ]
+
+    # Background brightness bucket edges and the palette keywords preferred
+    # in each bucket (include, exclude)
+    BRIGHTNESS_EDGES = [60, 100, 150]
+    COLOR_BUCKET_RULES = [
+        (['white', 'cream', 'light', 'neon'], []),         # Very dark background
+        (['gold', 'neon', 'bright', 'cyan', 'yellow'], []), # Dark background
+        ([], ['black']),                                   # Medium brightness
+        (['black', 'deep', 'dark', 'burgundy'], []),       # Light background
+    ]
+
     def __init__(self, config_path: Optional[str] = None):
         """Initialize VideoGenerator with variety system."""
         if config_path is None:
@@ -116,9 +320,50 @@ class VideoGenerator:
 
         self.visual_styles = self.config["visual_styles"]
         self.fonts = self.config["fonts"]
+
+        # Parse every palette color to RGB once instead of per overlay
+        for style in self.visual_styles.values():
+            style['colors_rgb'] = {
+                key: self._hex_to_rgb(value) for key, value in style['colors'].items()
+            }
+            style['_color_buckets_by_idx'] = [
+                [
+                    c for c in style['colors']
+                    if (not include or any(x in c for x in include))
+                    and not any(x in c for x in exclude)
+                ]
+                for include, exclude in self.COLOR_BUCKET_RULES
+            ]
+        self._gradient_colors_rgb = [
+            (self._hex_to_rgb(start), self._hex_to_rgb(end))
+            for start, end in self.GRADIENT_COLORS
+        ]
+        self._gradient_cache: Dict[Tuple, np.ndarray] = {}
+        self._watermark_cache: Dict[str, Tuple[np.ndarray, Tuple[int, int]]] = {}
+
+        # Music library is scanned once, not on every reel
+        music_dir = Path("music")
+        self._music_files = sorted(music_dir.glob("*.mp3")) if music_dir.exists() else []
         
         Path("output/reels").mkdir(parents=True, exist_ok=True)
-        Path("output/audio").mkdir(parents=True, exist_ok=True)
+        self.overlay_cache_dir = Path("output/overlay_cache")
+        self.overlay_cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # Pick the H.264 encoder once: the first usable GPU encoder, else x264
+        hw_encoder = next(
+            (enc for enc in self.HW_ENCODERS if _hw_encoder_works(enc[0], enc[1])), None
+        )
+        if hw_encoder is not None:
+            self._h264_codec, self._encoder_preset, params = hw_encoder
+            self._encoder_params = list(params)
+        else:
+            self._h264_codec = 'libx264'
+            # Overridable per machine via video_settings.x264_preset
+            self._encoder_preset = self.config.get("video_settings", {}).get("x264_preset", "veryfast")
+            # Fixed 2s GOP: no scene-cut keyframes between the -g interval.
+            # Frame threading (x264 default) beats sliced threads on throughput.
+            self._encoder_params = ['-x264-params', f'keyint={self.fps * 2}:scenecut=0']
+        logger.info(f"Video encoder: {self._h264_codec}")
 
         # Initialize history tracking
         state_file = Path("output/.style_history.json")
@@ -130,8 +375,8 @@ class VideoGenerator:
         logger.info("VideoGenerator initialized (EXTREME VARIETY MODE)")
         logger.info(f"Available styles: {len(self.visual_styles)}")
 
-    def _select_style(self) -> Tuple[str, Dict]:
-        """Select a visual style that hasn't been used recently."""
+    def _select_style(self, record: bool = True) -> Tuple[str, Dict]:
+        """Select a visual style that hasn't been used recently (recorded unless record=False)."""
         all_style_names = list(self.visual_styles.keys())
         
         # Get styles that weren't recently used
@@ -142,7 +387,8 @@ class VideoGenerator:
         selected_style = self.visual_styles[selected_name]
         
         # Record usage
-        self.style_history.add_style(selected_name)
+        if record:
+            self.style_history.add_style(selected_name)
         
         logger.info(f"\n🎨 STYLE SELECTED: {selected_style['name']}")
         logger.info(f"   Font: {selected_style['font_primary']}")
@@ -153,19 +399,23 @@ class VideoGenerator:
 
     def _hex_to_rgb(self, hex_color: str) -> Tuple[int, int, int]:
         """Convert hex to RGB."""
-        hex_color = hex_color.lstrip('#')
-        return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+        value = int(hex_color.lstrip('#'), 16)
+        return ((value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF)
 
-    def _analyze_background_color(self, video_path: str, style_colors: Dict) -> str:
+    def _pick_color_from_frame(self, frame: np.ndarray, style: Dict) -> str:
         """
-        Analyze video background and pick best color from current style's palette.
+        Analyze a background frame and pick best color from current style's palette.
+
+        Args:
+            frame: RGB frame (H x W x 3) captured when the background was opened
+            style: Current visual style (with precomputed color buckets)
+
+        Returns:
+            Key of the chosen color in style['colors']
         """
+        style_colors = style['colors']
         try:
-            video = VideoFileClip(video_path)
-            middle_frame = video.get_frame(video.duration / 2)
-            video.close()
-            
-            img = Image.fromarray(middle_frame)
+            img = Image.fromarray(frame)
             
             center_x = img.width // 2
             center_y = img.height // 2
@@ -187,32 +437,11 @@ class VideoGenerator:
             
             logger.info(f"Background: R={avg_r:.0f} G={avg_g:.0f} B={avg_b:.0f} Brightness={brightness:.0f}")
             
-            # Smart color selection based on brightness and style palette
-            available_colors = list(style_colors.keys())
-            
-            # Very dark background
-            if brightness < 60:
-                # Prefer: white, cream, light colors
-                preferred = [c for c in available_colors if any(x in c for x in ['white', 'cream', 'light', 'neon'])]
-                return random.choice(preferred) if preferred else available_colors[0]
-            
-            # Dark background
-            elif brightness < 100:
-                # Prefer: bright colors, gold, neon
-                preferred = [c for c in available_colors if any(x in c for x in ['gold', 'neon', 'bright', 'cyan', 'yellow'])]
-                return random.choice(preferred) if preferred else available_colors[0]
-            
-            # Medium brightness
-            elif brightness < 150:
-                # Avoid very dark colors
-                preferred = [c for c in available_colors if 'black' not in c]
-                return random.choice(preferred) if preferred else available_colors[0]
-            
-            # Light background
-            else:
-                # Prefer: dark colors, deep tones
-                preferred = [c for c in available_colors if any(x in c for x in ['black', 'deep', 'dark', 'burgundy'])]
-                return random.choice(preferred) if preferred else available_colors[0]
+            # Smart color selection: bucket the brightness, look up the
+            # preferred colors precomputed for this style in __init__
+            bucket_idx = int(np.digitize(brightness, self.BRIGHTNESS_EDGES))
+            preferred = style['_color_buckets_by_idx'][bucket_idx]
+            return random.choice(preferred) if preferred else next(iter(style_colors))
                 
         except Exception as e:
             logger.error(f"Color analysis failed: {e}")
@@ -224,67 +453,56 @@ class VideoGenerator:
         style: Dict,
         text_color_key: str,
         scene_type: str
-    ) -> Image.Image:
-        """Create text overlay with style-specific formatting."""
-        img = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+    ) -> Tuple[Image.Image, Tuple[int, int]]:
+        """
+        Create text overlay with style-specific formatting.
+
+        Returns:
+            (RGBA image covering just the text block, (x, y) of its top-left
+            corner in the 1080x1920 frame)
+        """
+        # Measure on a scratch surface; the real canvas is sized to the text
+        draw = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
 
         # Get color from style palette
-        text_color_hex = style['colors'][text_color_key]
-        text_color = self._hex_to_rgb(text_color_hex) + (255,)
+        text_color = style['colors_rgb'][text_color_key] + (255,)
 
         # Load font based on style
         try:
-            font_name = style['font_primary']
-            font_config = self.fonts[font_name]
-            font_path = Path(__file__).parent.parent / font_config['path']
-            font_size = font_config['sizes'][scene_type]
-            
+            font_path, font_size = self._style_font(style, scene_type)
+
             # Try style font first
             if font_path.exists():
-                font = ImageFont.truetype(str(font_path), font_size)
+                font = _load_font(str(font_path), font_size)
             else:
                 # Fallback to DejaVu Bold
-                raise FileNotFoundError("Style font not found, using DejaVu")
+                raise FileNotFoundError("Style font not found")
         except Exception as e:
             logger.warning(f"Font load failed: {e}, using DejaVu fallback")
-            # Try system DejaVu fonts
+            # Try system DejaVu fonts (resolved once, then cached)
             font_size = 70  # Default large size
-            dejavu_paths = [
-                "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-                "/System/Library/Fonts/Supplemental/Arial Bold.ttf",  # Mac
-                "C:\\Windows\\Fonts\\arialbd.ttf",  # Windows
-                Path(__file__).parent.parent / "fonts" / "DejaVuSans-Bold.ttf"
-            ]
-            
-            font = None
-            for path in dejavu_paths:
-                try:
-                    font = ImageFont.truetype(str(path), font_size)
-                    logger.info(f"Using fallback font: {path}")
-                    break
-                except:
-                    continue
-            
-            if font is None:
-                # Last resort - load_default() but it's TINY
-                logger.error("No fonts available! Using tiny default font")
-                font = ImageFont.load_default()
+            font = _load_fallback_font(font_size)
 
-        # Word wrapping
+        # Word wrapping (running pixel width, one getlength() per word)
         words = text.split()
         lines = []
         current_line = []
+        current_width = 0.0
+        space_width = font.getlength(' ')
+        max_width = self.width - 120
         
         for word in words:
-            test_line = ' '.join(current_line + [word])
-            bbox = draw.textbbox((0, 0), test_line, font=font)
-            if bbox[2] - bbox[0] < self.width - 120:
+            word_width = font.getlength(word)
+            if not current_line:
+                current_line = [word]
+                current_width = word_width
+            elif current_width + space_width + word_width < max_width:
                 current_line.append(word)
+                current_width += space_width + word_width
             else:
-                if current_line:
-                    lines.append(' '.join(current_line))
+                lines.append(' '.join(current_line))
                 current_line = [word]
+                current_width = word_width
         
         if current_line:
             lines.append(' '.join(current_line))
@@ -305,24 +523,133 @@ class VideoGenerator:
         total_height = len(lines) * line_height
         y = start_y - (total_height // 2)
 
-        # Draw text with shadow for better visibility
+        # Lay out each line, tracking the inked area (outline included)
+        placed = []
+        left, top, right, bottom = self.width, self.height, 0, 0
         for line in lines:
             bbox = draw.textbbox((0, 0), line, font=font)
             text_width = bbox[2] - bbox[0]
             x = (self.width - text_width) // 2
-            
-            # Shadow
-            for offset in [(2, 2), (-2, 2), (2, -2), (-2, -2)]:
-                draw.text((x + offset[0], y + offset[1]), line, 
-                         font=font, fill=(0, 0, 0, 180))
-            
-            # Main text
-            draw.text((x, y), line, font=font, fill=text_color)
+            placed.append((x, y, line))
+
+            ink = draw.textbbox((x, y), line, font=font, stroke_width=2)
+            left, top = min(left, ink[0]), min(top, ink[1])
+            right, bottom = max(right, ink[2]), max(bottom, ink[3])
             y += line_height
 
-        return img
+        # Allocate only the text block (clipped to the frame) instead of a
+        # full 1080x1920 RGBA canvas
+        left, top = max(left, 0), max(top, 0)
+        right, bottom = max(min(right, self.width), left), max(min(bottom, self.height), top)
+        img = Image.new('RGBA', (right - left, bottom - top), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+
+        # Draw text with a dark outline for better visibility
+        for x, y, line in placed:
+            # Main text + 2px outline in one pass (replaces 4 offset shadow draws)
+            draw.text((x - left, y - top), line, font=font, fill=text_color,
+                      stroke_width=2, stroke_fill=(0, 0, 0, 180))
+
+        return img, (left, top)
 
-    def _create_attribution_watermark(self, source: str, duration: float) -> ImageClip:
+    def _style_font(self, style: Dict, scene_type: str) -> Tuple[Path, int]:
+        """Font file and size a style uses for a scene (the file may be missing)."""
+        font_config = self.fonts[style['font_primary']]
+        return Path(__file__).parent.parent / font_config['path'], font_config['sizes'][scene_type]
+
+    def _overlay_cache_path(self, text: str, style: Dict, text_color_key: str, scene_type: str) -> Optional[Path]:
+        """
+        Content-addressed cache file for a rendered text overlay.
+
+        Returns None when the style font is unavailable: the DejaVu fallback
+        render must not be stored under the style's key.
+        """
+        try:
+            font_path, font_size = self._style_font(style, scene_type)
+        except KeyError:
+            return None
+        if not font_path.exists():
+            return None
+
+        key_src = "|".join([
+            self.OVERLAY_CACHE_VERSION, text, scene_type,
+            str(font_path.resolve()), str(font_size), style['text_position'],
+            style['colors'][text_color_key], f"{self.width}x{self.height}"
+        ])
+        cache_key = hashlib.sha1(key_src.encode()).hexdigest()[:16]
+        return self.overlay_cache_dir / f"overlay_{cache_key}.npz"
+
+    def _get_text_overlay(
+        self, text: str, style: Dict, text_color_key: str, scene_type: str
+    ) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """
+        Return a scene's text box and its (x, y) position, rendering only on a cache miss.
+
+        Only the text box is kept (in the cache file and in memory); the
+        render paths place it at its position instead of blending a
+        mostly transparent full frame.
+        """
+        cache_path = self._overlay_cache_path(text, style, text_color_key, scene_type)
+
+        if cache_path is not None:
+            try:
+                with np.load(cache_path) as cached:
+                    y0, x0 = (int(v) for v in cached['origin'])
+                    box = cached['box']
+                os.utime(cache_path)  # mark as recently used for the cache cleanup
+                return box, (x0, y0)
+            except FileNotFoundError:
+                pass  # not cached yet (or just pruned)
+            except Exception as e:
+                logger.warning(f"Overlay cache read failed: {e}, re-rendering")
+
+        img, (x0, y0) = self._create_text_overlay(
+            text=text,
+            style=style,
+            text_color_key=text_color_key,
+            scene_type=scene_type
+        )
+        box = np.asarray(img)
+        if cache_path is None:
+            return box, (x0, y0)
+
+        # Write under a unique name and rename, so a concurrent reader
+        # never loads a half-written file
+        temp_path = cache_path.with_name(f"{cache_path.stem}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            with open(temp_path, "wb") as f:
+                np.savez(f, origin=np.array([y0, x0]), box=box)
+            temp_path.replace(cache_path)
+        except Exception as e:
+            temp_path.unlink(missing_ok=True)
+            logger.warning(f"Overlay cache write failed: {e}")
+
+        return box, (x0, y0)
+
+    def _cleanup_overlay_cache(self):
+        """Remove the least recently used overlays if the cache is too large."""
+        try:
+            cached_files = list(self.overlay_cache_dir.glob("overlay_*.npz"))
+            if len(cached_files) <= self.MAX_OVERLAY_CACHE_FILES:
+                return
+
+            def last_used(path: Path) -> float:
+                try:
+                    return path.stat().st_mtime
+                except FileNotFoundError:
+                    return 0.0  # already removed by a concurrent run
+
+            cached_files.sort(key=last_used)
+            files_to_remove = cached_files[:-self.MAX_OVERLAY_CACHE_FILES]
+            for old_file in files_to_remove:
+                old_file.unlink(missing_ok=True)
+
+            logger.info(f"Overlay cache cleanup: removed {len(files_to_remove)} old files")
+
+        except Exception as e:
+            logger.error(f"Overlay cache cleanup failed: {e}")
+
+    def _create_attribution_watermark(self, source: str) -> Image.Image:
         """
         Create small attribution watermark for API compliance.
         
@@ -331,10 +658,9 @@ class VideoGenerator:
         
         Args:
             source: Source name (Pexels, Pixabay, etc.)
-            duration: Duration of the clip
             
         Returns:
-            ImageClip with attribution text
+            Full-frame RGBA image with attribution text
         """
         # Create transparent image
         img = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
@@ -345,7 +671,7 @@ class VideoGenerator:
         
         try:
             font_path = Path(__file__).parent.parent / "fonts" / "DejaVuSans.ttf"
-            font = ImageFont.truetype(str(font_path), 14)  # Smaller: 20 → 14
+            font = _load_font(str(font_path), 14)  # Smaller: 20 → 14
         except:
             font = ImageFont.load_default()
         
@@ -362,44 +688,75 @@ class VideoGenerator:
         # Draw text
         draw.text((x, y), attribution_text, font=font, fill=text_color)
         
-        # Save and create clip
-        temp_path = Path("output") / "temp_attribution.png"
-        img.save(temp_path)
-        
-        clip = ImageClip(str(temp_path), duration=duration)
-        temp_path.unlink()
-        
         logger.info(f"✅ Added subtle attribution: {source}")
         
-        return clip
+        return img
+
+    def _get_attribution_watermark(self, source: str) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """
+        Attribution watermark box and (x, y) position, rendered once per source.
 
-    def _create_background_clip(self, category: str, duration: float) -> Tuple[object, str]:
+        The text and position never change, so later reels reuse the pixels
+        instead of rasterizing the text again.
+        """
+        watermark = self._watermark_cache.get(source)
+        if watermark is None:
+            rgba = np.asarray(self._create_attribution_watermark(source))
+            y0, y1, x0, x1 = self._visible_box(rgba) or (0, 0, 0, 0)
+            box = rgba[y0:y1, x0:x1].copy()
+            box.flags.writeable = False
+            watermark = (box, (x0, y0))
+            self._watermark_cache[source] = watermark
+        return watermark
+
+    def _create_background_clip(self, category: str, duration: float,
+                                bg_future: Optional[Future] = None,
+                                record: bool = True) -> Tuple[object, str, Optional[np.ndarray]]:
         """
         Create 4K video background OR high-res photo slideshow with variety tracking.
+
+        Args:
+            category: Content category used to pick the background
+            duration: Length of the reel in seconds
+            bg_future: Pending _prefetch_background() call started earlier, if any
+            record: Add the chosen video to the background history
         
-        Returns: (video_clip, video_path_or_type)
+        Returns: (video_clip, video_path_or_type, middle_frame_or_None)
         """
         # Try 4K video first
         try:
-            bg_video_path = self.background_manager.get_background_video(category)
+            if bg_future is not None:
+                bg_video_path = bg_future.result()
+            else:
+                bg_video_path = self.background_manager.get_background_video(category)
 
             if bg_video_path and os.path.exists(bg_video_path):
-                # Generate hash for variety tracking
-                bg_hash = hashlib.md5(str(bg_video_path).encode()).hexdigest()[:8]
+                # The path itself is the variety-tracking key (history keeps only 5)
+                bg_hash = str(bg_video_path)
                 
                 # Check if recently used
                 if self.style_history.should_avoid_background(bg_hash):
                     logger.info(f"⏭️  Skipping recently used video background")
                     bg_video_path = None  # Force photo slideshow
                 else:
-                    self.style_history.add_background(bg_hash)
+                    if record:
+                        self.style_history.add_background(bg_hash)
                     logger.info(f"Using 4K video: {bg_video_path}")
 
                     try:
-                        video = VideoFileClip(bg_video_path)
-
-                        if video.h != self.height:
-                            video = video.resized(height=self.height)
+                        # Open the pre-scaled 1080x1920 copy when one is cached;
+                        # its audio is never used, so don't spawn an audio reader
+                        video_path = self._normalized_background(bg_video_path)
+                        if video_path == bg_video_path:
+                            # Uncached original: let the ffmpeg reader scale to the
+                            # reel height instead of a per-frame resized() in Python
+                            video = VideoFileClip(video_path, audio=False,
+                                                  target_resolution=(None, self.height))
+                        else:
+                            video = VideoFileClip(video_path, audio=False)
+
+                        # Grab the frame for color analysis from this same reader
+                        middle_frame = video.get_frame(video.duration / 2)
 
                         if video.w > self.width:
                             x_center = video.w / 2
@@ -408,14 +765,23 @@ class VideoGenerator:
                                 x2=x_center + self.width/2
                             )
 
-                        if video.duration < duration:
-                            n = int(duration / video.duration) + 1
-                            video = concatenate_videoclips([video] * n)
-
-                        video = video.subclipped(0, duration)
+                        if video.duration < self.MIN_MOTION_BG_DURATION:
+                            # Too short to loop nicely - freeze one frame instead of
+                            # decoding the same few frames for the whole reel
+                            source_duration = video.duration
+                            still_frame = video.get_frame(source_duration / 2)
+                            video.close()
+                            video = ImageClip(still_frame, duration=duration)
+                            logger.info(f"Short background ({source_duration:.1f}s) - using still frame")
+                        elif video.duration >= duration:
+                            video = video.with_duration(duration)
+                        else:
+                            # Loop by time-wrapping a single reader instead of
+                            # concatenating N copies of the clip
+                            video = video.with_effects([vfx.Loop(duration=duration)])
 
                         logger.info("✅ 4K video background")
-                        return (video, bg_video_path)
+                        return (video, bg_video_path, middle_frame)
 
                     except Exception as e:
                         logger.error(f"Video processing failed: {e}")
@@ -437,25 +803,101 @@ class VideoGenerator:
             if photos:
                 slideshow_clip = self._create_photo_slideshow(photos, duration)
                 logger.info("✅ High-res photo slideshow background")
-                return (slideshow_clip, "photo_slideshow")
+                return (slideshow_clip, "photo_slideshow", None)
         except Exception as e:
             logger.error(f"Photo slideshow failed: {e}")
         
         # Final fallback: gradient
         logger.warning("Using gradient fallback")
+        # The cached array goes to ImageClip as-is (no PIL round trip or copy)
         gradient = self._create_gradient_background(duration)
-        return (ImageClip(np.array(gradient), duration=duration), "gradient")
+        return (ImageClip(gradient, duration=duration), "gradient", None)
     
-    def _create_photo_slideshow(self, photo_paths: List[Path], duration: float) -> object:
+    def _prefetch_background(self, category: str) -> Optional[str]:
+        """
+        Download the background video and warm its normalized copy.
+
+        Runs alongside TTS, so the download and the one-off ffmpeg
+        scale/crop overlap the network wait. Returns the source path for
+        _create_background_clip, which then hits the normalized cache.
+        """
+        bg_video_path = self.background_manager.get_background_video(category)
+        if (bg_video_path and os.path.exists(bg_video_path)
+                and not self.style_history.should_avoid_background(str(bg_video_path))):
+            self._normalized_background(bg_video_path)
+        return bg_video_path
+
+    def _normalized_background(self, source_path: str) -> str:
+        """
+        Return a cached 1080x1920 H.264 copy of a background video.
+
+        The first use of a source scales/crops it once (no audio, capped at
+        the longest reel - ffmpeg loops it past that) into the background
+        cache; later reels decode that small file instead of the 4K original.
+        This only pays off with a warm local cache: a fresh checkout (e.g. CI
+        with no persisted output/) pays one extra encode per reel, so set
+        background_videos.normalize_cache to false there. Falls back to the
+        source path when caching is disabled or ffmpeg fails.
+        """
+        cache_dir = getattr(self.background_manager, 'cache_dir', None)
+        if not cache_dir or not self.config.get("background_videos", {}).get("normalize_cache", True):
+            return source_path
+
+        max_seconds = int(math.ceil(self.TARGET_DURATION_MAX))
+        partial_path = None
+        try:
+            stat = os.stat(source_path)
+            key_src = (f"{os.path.abspath(source_path)}|{stat.st_mtime_ns}|{stat.st_size}"
+                       f"|w{self.width}h{self.height}f{self.fps}t{max_seconds}")
+            cache_key = hashlib.sha1(key_src.encode()).hexdigest()[:16]
+
+            normalized_dir = Path(cache_dir) / "normalized"
+            normalized_path = normalized_dir / f"bg_{cache_key}.mp4"
+            if normalized_path.exists():
+                os.utime(normalized_path)  # most recently used survives cache cleanup
+                logger.info(f"Using normalized background: {normalized_path.name}")
+                return str(normalized_path)
+
+            normalized_dir.mkdir(parents=True, exist_ok=True)
+            # Unique per run so concurrent reels never write the same file
+            partial_path = normalized_path.with_suffix(f".{uuid.uuid4().hex[:8]}.partial.mp4")
+            subprocess.run(
+                [
+                    FFMPEG_BINARY, '-hide_banner', '-loglevel', 'error', '-y',
+                    '-i', source_path, '-t', str(max_seconds), '-an',
+                    '-vf', f"scale={self.width}:{self.height}:force_original_aspect_ratio=increase,"
+                           f"crop={self.width}:{self.height},setsar=1,fps={self.fps}",
+                    '-c:v', 'libx264', '-preset', 'veryfast', '-crf', '18',
+                    '-pix_fmt', 'yuv420p', str(partial_path)
+                ],
+                check=True,
+                capture_output=True
+            )
+            # Rename last so an interrupted run never leaves a truncated cache hit
+            partial_path.replace(normalized_path)
+            logger.info(f"✅ Cached normalized background: {normalized_path.name}")
+            return str(normalized_path)
+
+        except Exception as e:
+            if partial_path is not None:
+                partial_path.unlink(missing_ok=True)
+            logger.warning(f"Background normalization failed: {e}, using original")
+            return source_path
+
+    def _create_photo_slideshow(self, photo_paths: List[Path], duration: float) -> PhotoSlideshow:
         """
-        Create smooth photo slideshow with Ken Burns effect.
+        Create fast-cut photo slideshow from the source photos.
+
+        Only each photo's header is read here (for its orientation); the
+        ffmpeg renderer cuts the slideshow straight from the files, and
+        _build_slideshow_clip decodes them only if MoviePy needs the frames.
         
         Args:
             photo_paths: List of photo file paths
             duration: Total duration in seconds
             
         Returns:
-            VideoClip of slideshow
+            PhotoSlideshow describing the cut list
         """
         if not photo_paths:
             raise ValueError("No photos provided for slideshow")
@@ -465,32 +907,17 @@ class VideoGenerator:
         logger.info(f"  Photos: {len(photo_paths)}")
         
         photo_duration = 0.5  # seconds per photo
-        transition_duration = 0.2  # crossfade duration
+        sources = []  # (path, landscape) per usable photo
         
-        clips = []
-        
-        for i, photo_path in enumerate(photo_paths):
+        for photo_path in photo_paths:
             try:
-                # Load and resize photo
-                img = Image.open(photo_path)
-                
-                # Ensure portrait orientation
-                if img.width > img.height:
-                    img = img.rotate(90, expand=True)
-                
-                # Resize to 1080x1920
-                img = img.resize((self.width, self.height), Image.Resampling.LANCZOS)
-                
-                # Convert to numpy array
-                img_array = np.array(img)
-                
-                # Create simple clip (old MoviePy syntax)
-                clip = ImageClip(img_array, duration=photo_duration)
-                
-                clips.append(clip)
+                # Image.open only parses the header - no pixels are decoded
+                with Image.open(photo_path) as img:
+                    landscape = img.width > img.height
+                sources.append((Path(photo_path), landscape))
                 
                 # Stop when we have enough for duration
-                total_time = len(clips) * photo_duration
+                total_time = len(sources) * photo_duration
                 if total_time >= duration:
                     break
                     
@@ -498,46 +925,89 @@ class VideoGenerator:
                 logger.warning(f"Failed to load photo {photo_path}: {e}")
                 continue
         
-        if not clips:
+        if not sources:
             raise ValueError("No valid photos loaded for slideshow")
         
-        # Concatenate all clips
-        final_clip = concatenate_videoclips(clips, method="compose")
-        
-        # Trim to exact duration
-        final_clip = final_clip.subclipped(0, min(duration, final_clip.duration))
+        slideshow = PhotoSlideshow(
+            sources, photo_duration,
+            min(duration, len(sources) * photo_duration),
+            (self.width, self.height)
+        )
         
-        logger.info(f"✅ Slideshow created: {len(clips)} photos, {final_clip.duration:.2f}s")
+        logger.info(f"✅ Slideshow created: {len(sources)} photos, {slideshow.duration:.2f}s")
         
-        return final_clip
+        return slideshow
 
-    def _create_gradient_background(self, duration: float) -> Image.Image:
-        """Create gradient background as fallback."""
-        img = Image.new('RGB', (self.width, self.height))
-        draw = ImageDraw.Draw(img)
+    def _build_slideshow_clip(self, slideshow: PhotoSlideshow) -> object:
+        """
+        Decode a slideshow's photos into a MoviePy clip of 1080x1920 stills.
+
+        Only needed by the MoviePy fallback and previews; photos that fail to
+        decode are skipped.
+        """
+        clips = []
         
-        # Random gradient colors
-        colors = [
-            ("#6B21A8", "#8B5CF6"),  # Purple
-            ("#1E40AF", "#3B82F6"),  # Blue
-            ("#BE123C", "#FB7185"),  # Pink
-            ("#4338CA", "#6366F1"),  # Indigo
-        ]
-        start_color, end_color = random.choice(colors)
+        for photo_path, landscape in slideshow.photo_sources:
+            try:
+                # Load photo (JPEG draft mode decodes straight at a reduced scale)
+                img = Image.open(photo_path)
+                draft_size = (self.height, self.width) if landscape else (self.width, self.height)
+                img.draft('RGB', draft_size)
+                img = img.convert('RGB')
+
+                # Ensure portrait orientation (transpose is a plain pixel copy)
+                if landscape:
+                    img = img.transpose(Image.Transpose.ROTATE_90)
+
+                # Resize to 1080x1920
+                img = img.resize(
+                    (self.width, self.height),
+                    Image.Resampling.BILINEAR,
+                    reducing_gap=2.0
+                )
+
+                # Convert to numpy array
+                img_array = np.asarray(img)
+                
+                # Create simple clip (old MoviePy syntax)
+                clips.append(ImageClip(img_array, duration=slideshow.photo_duration))
+                    
+            except Exception as e:
+                logger.warning(f"Failed to load photo {photo_path}: {e}")
+                continue
         
-        start_rgb = self._hex_to_rgb(start_color)
-        end_rgb = self._hex_to_rgb(end_color)
+        if not clips:
+            raise ValueError("No valid photos loaded for slideshow")
         
-        for y in range(self.height):
-            ratio = y / self.height
-            r = int(start_rgb[0] + (end_rgb[0] - start_rgb[0]) * ratio)
-            g = int(start_rgb[1] + (end_rgb[1] - start_rgb[1]) * ratio)
-            b = int(start_rgb[2] + (end_rgb[2] - start_rgb[2]) * ratio)
-            draw.line([(0, y), (self.width, y)], fill=(r, g, b))
+        # Concatenate all clips (all frames are already 1080x1920, so "chain"
+        # just hands back each photo's array instead of compositing per frame)
+        final_clip = concatenate_videoclips(clips, method="chain")
         
-        return img
-
-    def generate_reel(self, content: Dict[str, str], category: str = "angel_numbers") -> str:
+        # Trim to exact duration
+        return final_clip.with_duration(min(slideshow.duration, final_clip.duration))
+
+    def _create_gradient_background(self, duration: float) -> np.ndarray:
+        """Create gradient background as fallback (read-only HxWx3 uint8 array)."""
+        # Random gradient colors (pre-parsed in __init__)
+        start_rgb, end_rgb = random.choice(self._gradient_colors_rgb)
+
+        # Each palette's pixels never change - build them once per process
+        arr = self._gradient_cache.get((start_rgb, end_rgb))
+        if arr is None:
+            start = np.array(start_rgb, dtype=np.float32)
+            end = np.array(end_rgb, dtype=np.float32)
+
+            # One (H, 3) color ramp, broadcast across the width
+            ratio = (np.arange(self.height, dtype=np.float32) / self.height)[:, None]
+            ramp = (start + (end - start) * ratio).astype(np.uint8)
+            arr = np.broadcast_to(ramp[:, None, :], (self.height, self.width, 3)).copy()
+            arr.setflags(write=False)
+            self._gradient_cache[(start_rgb, end_rgb)] = arr
+
+        return arr
+
+    def generate_reel(self, content: Dict[str, str], category: str = "angel_numbers",
+                      preview: bool = False) -> str:
         """
         Generate a 17s Instagram Reel with EXTREME VARIETY.
         
@@ -547,219 +1017,575 @@ class VideoGenerator:
         - Different colors
         - Different text positions
         - Different backgrounds
+
+        Temp files live in a per-run directory (on tmpfs when available) and
+        outputs are named by run id, so several reels can be generated at once.
+        Threads sharing one generator share its style history; worker
+        processes each keep their own, so their rotations don't see each other.
+
+        With preview=True the reel is written as a silent animated WebP (one
+        frame per scene) instead of an H.264 MP4 - a quick draft for checks.
+        Previews skip the audio mix and leave the style/background history
+        untouched, so they never use up a slot in the real rotation.
         """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = Path("output/reels") / f"reel_{timestamp}.mp4"
+        run_id = f"{timestamp}_{uuid.uuid4().hex[:8]}"
+        output_path = Path("output/reels") / f"reel_{run_id}.mp4"
 
-        # STEP 1: SELECT VISUAL STYLE (never repeat recent)
-        style_name, selected_style = self._select_style()
+        # Intermediate WAVs/PNGs are read once and deleted - keep them in RAM
+        temp_root = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        temp_dir = tempfile.TemporaryDirectory(prefix=f"reel_{run_id}_", dir=temp_root)
+        work_dir = Path(temp_dir.name)
+        background = None
 
-        # STEP 2: GENERATE AUDIO
-        logger.info("\nSTEP 1: Generating audio...")
-        
-        audio_segments = {}
-        base_speed = 1.15  # Base speed factor for natural pacing
+        try:
+            # STEP 1: SELECT VISUAL STYLE (never repeat recent)
+            style_name, selected_style = self._select_style(record=not preview)
+
+            # STEP 2: GENERATE AUDIO
+            logger.info("\nSTEP 1: Generating audio...")
         
-        for scene in ["hook", "meaning", "action", "cta"]:
-            text = content[scene]
-            audio_path = Path("output/audio") / f"{scene}_{timestamp}.mp3"
+            audio_segments = {}
+            base_speed = 1.15  # Base speed factor for natural pacing
+
+            # TTS calls are network-bound and independent - run all 4 at once.
+            # Voiceovers come back as WAV (LINEAR16) so there is no MP3 decode.
+            jobs = [
+                (scene, content[scene], work_dir / f"{scene}.wav")
+                for scene in self.SCENE_ORDER
+            ]
+            with ThreadPoolExecutor(max_workers=len(jobs) + 1) as executor:
+                # The stock video download (and its normalization) doesn't depend
+                # on the audio - prepare it while the voiceovers are synthesized
+                bg_future = executor.submit(self._prefetch_background, category)
+                list(executor.map(
+                    lambda job: self.audio_generator.generate_voiceover(
+                        text=job[1],
+                        output_path=str(job[2]),
+                        speed_factor=base_speed
+                    ),
+                    jobs
+                ))
+
+            # Load in fixed scene order so concatenation order is preserved
+            for scene, text, audio_path in jobs:
+                audio = AudioSegment.from_wav(str(audio_path))
+                # Audio is already sped up by generate_voiceover, no need to speed up again
+                audio_sped = audio
             
-            self.audio_generator.generate_voiceover(
-                text=text,
-                output_path=str(audio_path),
-                speed_factor=base_speed
+                audio_segments[scene] = {
+                    'text': text,
+                    'audio': audio_sped,
+                    'duration': len(audio_sped) / 1000.0
+                }
+
+            # Calculate duration
+            natural_duration = sum(seg['duration'] for seg in audio_segments.values())
+            required_speed = 1.0
+            final_duration = self.TARGET_DURATION_IDEAL
+
+            if natural_duration > self.TARGET_DURATION_MAX:
+                required_speed = natural_duration / self.TARGET_DURATION_MAX
+                total_speed = 1.15 * required_speed
+
+                if total_speed > self.MAX_SPEED:
+                    required_speed = self.MAX_SPEED / 1.15
+                    final_duration = natural_duration / required_speed
+                else:
+                    final_duration = self.TARGET_DURATION_MAX
+
+            if required_speed != 1.0:
+                for scene, seg in audio_segments.items():
+                    if preview:
+                        # Only the timing is needed - no need to stretch the audio
+                        seg['duration'] /= required_speed
+                        continue
+                    sped_up = _atempo(seg['audio'], required_speed)
+                    seg['audio'] = sped_up
+                    seg['duration'] = len(sped_up) / 1000.0
+
+            # Previews are silent: the voice track and music mix are only built for reels
+            final_audio = work_dir / "final.wav"
+            if not preview:
+                # Concatenate audio (single join of the raw PCM buffers)
+                scene_audio = [audio_segments[scene]['audio'] for scene in self.SCENE_ORDER]
+                first = scene_audio[0]
+                pcm_parts = [
+                    part.set_frame_rate(first.frame_rate)
+                        .set_channels(first.channels)
+                        .set_sample_width(first.sample_width)
+                        .raw_data
+                    for part in scene_audio
+                ]
+                combined = AudioSegment(
+                    data=b''.join(pcm_parts),
+                    sample_width=first.sample_width,
+                    frame_rate=first.frame_rate,
+                    channels=first.channels
+                )
+
+                # Pad/trim to the exact video length so the track can be muxed as-is
+                target_ms = int(round(final_duration * 1000))
+                if len(combined) < target_ms:
+                    combined += AudioSegment.silent(
+                        duration=target_ms - len(combined), frame_rate=combined.frame_rate
+                    )
+                combined = combined[:target_ms]
+
+                # Voice PCM is piped straight into the music mix; the mixed WAV is
+                # the only intermediate and the final AAC mux the only lossy encode
+                self._add_music(combined, final_audio)
+
+            # STEP 3: CREATE BACKGROUND (avoid repeats)
+            logger.info(f"\nSTEP 3: Creating background ({final_duration:.2f}s)...")
+            background, bg_path, bg_frame = self._create_background_clip(
+                category, final_duration, bg_future, record=not preview
             )
-            
-            audio = AudioSegment.from_file(str(audio_path))
-            # Audio is already sped up by generate_voiceover, no need to speed up again
-            audio_sped = audio
-            
-            audio_segments[scene] = {
-                'text': text,
-                'audio': audio_sped,
-                'duration': len(audio_sped) / 1000.0,
-                'path': str(audio_path)
-            }
-
-        # Calculate duration
-        natural_duration = sum(seg['duration'] for seg in audio_segments.values())
-        required_speed = 1.0
-        final_duration = self.TARGET_DURATION_IDEAL
 
-        if natural_duration > self.TARGET_DURATION_MAX:
-            required_speed = natural_duration / self.TARGET_DURATION_MAX
-            total_speed = 1.15 * required_speed
-
-            if total_speed > self.MAX_SPEED:
-                required_speed = self.MAX_SPEED / 1.15
-                final_duration = natural_duration / required_speed
+            # STEP 4: ANALYZE AND PICK TEXT COLOR
+            if bg_frame is not None:
+                # Real video file - analyze the frame captured when it was opened
+                text_color_key = self._pick_color_from_frame(bg_frame, selected_style)
             else:
-                final_duration = self.TARGET_DURATION_MAX
-
-        if required_speed != 1.0:
-            for scene, seg in audio_segments.items():
-                sped_up = seg['audio'].speedup(playback_speed=required_speed)
-                seg['audio'] = sped_up
-                seg['duration'] = len(sped_up) / 1000.0
-
-        # Concatenate audio
-        combined = AudioSegment.empty()
-        for scene in ["hook", "meaning", "action", "cta"]:
-            combined += audio_segments[scene]['audio']
-
-        temp_voice = Path("output/audio") / f"temp_voice_{timestamp}.mp3"
-        combined.export(str(temp_voice), format='mp3')
-
-        final_audio = Path("output/audio") / f"final_{timestamp}.mp3"
-        self._add_music(temp_voice, final_audio, final_duration)
-        temp_voice.unlink()
-
-        # STEP 3: CREATE BACKGROUND (avoid repeats)
-        logger.info(f"\nSTEP 3: Creating background ({final_duration:.2f}s)...")
-        background, bg_path = self._create_background_clip(category, final_duration)
-
-        # STEP 4: ANALYZE AND PICK TEXT COLOR
-        if bg_path and bg_path != "gradient" and bg_path != "photo_slideshow":
-            # Real video file - analyze it
-            text_color_key = self._analyze_background_color(bg_path, selected_style['colors'])
-        else:
-            # Gradient or photo slideshow - pick smart default based on style
-            available_colors = list(selected_style['colors'].keys())
+                # Gradient or photo slideshow - pick smart default based on style
+                available_colors = list(selected_style['colors'].keys())
             
-            # Prefer bright/light colors for gradients (they're usually dark)
-            preferred = [c for c in available_colors if any(x in c for x in ['white', 'gold', 'light', 'neon', 'bright'])]
+                # Prefer bright/light colors for gradients (they're usually dark)
+                preferred = [c for c in available_colors if any(x in c for x in ['white', 'gold', 'light', 'neon', 'bright'])]
             
-            if preferred:
-                text_color_key = random.choice(preferred)
-            else:
-                text_color_key = available_colors[0]
+                if preferred:
+                    text_color_key = random.choice(preferred)
+                else:
+                    text_color_key = available_colors[0]
             
-            logger.info(f"Using default color for {bg_path}: {text_color_key}")
+                logger.info(f"Using default color for {bg_path}: {text_color_key}")
 
-        logger.info(f"✅ Text color: {text_color_key.upper()}")
+            logger.info(f"✅ Text color: {text_color_key.upper()}")
 
-        # STEP 5: CREATE TEXT OVERLAYS
-        logger.info("\nSTEP 4: Creating styled text overlays...")
+            # STEP 5: CREATE TEXT OVERLAYS
+            logger.info("\nSTEP 4: Creating styled text overlays...")
         
-        text_clips = []
-        current_time = 0.0
-
-        for scene in ["hook", "meaning", "action", "cta"]:
-            seg = audio_segments[scene]
+            overlay_layers = []  # (rgba_box, (x, y), start, duration)
+            current_time = 0.0
+
+            # Overlays are independent buffers - rasterize all 4 concurrently
+            # (repeats such as the CTA come straight from the overlay cache)
+            with ThreadPoolExecutor(max_workers=len(self.SCENE_ORDER)) as executor:
+                overlays = dict(zip(self.SCENE_ORDER, executor.map(
+                    lambda scene: self._get_text_overlay(
+                        text=audio_segments[scene]['text'],
+                        style=selected_style,
+                        text_color_key=text_color_key,
+                        scene_type=scene
+                    ),
+                    self.SCENE_ORDER
+                )))
+
+            # One cache scan per reel, after this reel's overlays are stored
+            self._cleanup_overlay_cache()
+
+            for scene in self.SCENE_ORDER:
+                seg = audio_segments[scene]
+                box, position = overlays[scene]
+                overlay_layers.append((box, position, current_time, seg['duration']))
             
-            text_img = self._create_text_overlay(
-                text=seg['text'],
-                style=selected_style,
-                text_color_key=text_color_key,
-                scene_type=scene
+                logger.info(f"   {scene}: {current_time:.2f}s → {current_time + seg['duration']:.2f}s")
+                current_time += seg['duration']
+
+            # Add attribution watermark (ONLY for Pexels - required by their API terms)
+            # Videvo is free with no attribution requirement
+            if bg_path and bg_path != "gradient" and isinstance(bg_path, str) and "pexels" in bg_path.lower():
+                box, position = self._get_attribution_watermark("Pexels")
+                overlay_layers.append((box, position, 0.0, final_duration))
+                logger.info(f"✅ Added attribution: Pexels")
+            else:
+                logger.info("No attribution needed (not Pexels)")
+
+            # STEP 6 + 7: COMPOSITE AND EXPORT
+            logger.info("\nSTEP 5: Compositing and exporting...")
+
+            # Every background kind renders in a single ffmpeg filter graph;
+            # a failed ffmpeg run falls back to MoviePy
+            rendered = False
+            if preview:
+                # Previews sample frames, so the photos have to be decoded
+                if isinstance(background, PhotoSlideshow):
+                    background = self._build_slideshow_clip(background)
+                output_path = output_path.with_suffix(".webp")
+                self._render_preview(background, overlay_layers, final_duration, output_path)
+                rendered = True
+            elif self._ffmpeg_background_input(background) is not None:
+                try:
+                    self._render_with_ffmpeg(
+                        background, overlay_layers, final_audio,
+                        final_duration, output_path, work_dir
+                    )
+                    rendered = True
+                except Exception as e:
+                    logger.error(f"ffmpeg render failed: {e}, falling back to MoviePy")
+
+            if not rendered:
+                if isinstance(background, PhotoSlideshow):
+                    background = self._build_slideshow_clip(background)
+                self._render_with_moviepy(
+                    background, overlay_layers, final_audio,
+                    final_duration, output_path
+                )
+        finally:
+            # One tree removal covers every voiceover, WAV and PNG of the run
+            temp_dir.cleanup()
+            # Release the background reader even when a step above failed
+            if background is not None:
+                background.close()
+
+        # Persist style/background history once per reel (never for previews)
+        if not preview:
+            self.style_history.flush()
+
+        logger.info("\n" + "="*70)
+        logger.info("✅ VIDEO COMPLETE - EXTREME VARIETY MODE")
+        logger.info("="*70)
+        logger.info(f"Output: {output_path}")
+        logger.info(f"Style: {selected_style['name']}")
+        logger.info(f"Font: {selected_style['font_primary']}")
+        logger.info(f"Text Position: {selected_style['text_position']}")
+        logger.info(f"Color: {text_color_key} ({selected_style['colors'][text_color_key]})")
+        logger.info(f"Duration: {final_duration:.2f}s")
+        logger.info("="*70 + "\n")
+
+        return str(output_path)
+
+    def _encoder_args(self, still: bool = False) -> List[str]:
+        """
+        Extra ffmpeg output options shared by both render paths.
+
+        Args:
+            still: True when the background is a single static image
+        """
+        # 4:2:0 for player compatibility; given MoviePy's rgb24 frames a GPU
+        # encoder could otherwise pick a 4:4:4 format (QSV/AMF want NV12)
+        pix_fmt = 'nv12' if self._h264_codec in ('h264_qsv', 'h264_amf') else 'yuv420p'
+        params = self._encoder_params + [
+            '-g', str(self.fps * 2),  # keyframe every 2s - plenty for a 17s Reel
+            '-pix_fmt', pix_fmt,
+            '-movflags', '+faststart'
+        ]
+        # Static gradient + static text: let x264 tune for still content
+        if still and self._h264_codec == 'libx264':
+            params += ['-tune', 'stillimage']
+        return params
+
+    @staticmethod
+    def _visible_box(rgba: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+        """Bounding box (y0, y1, x0, x1) of an overlay's non-transparent pixels."""
+        rows = np.flatnonzero(rgba[:, :, 3].any(axis=1))
+        if len(rows) == 0:
+            return None
+        cols = np.flatnonzero(rgba[:, :, 3].any(axis=0))
+        return int(rows[0]), int(rows[-1]) + 1, int(cols[0]), int(cols[-1]) + 1
+
+    def _ffmpeg_background_input(self, background) -> Optional[str]:
+        """
+        Return the kind of ffmpeg input that reproduces `background`.
+
+        Returns:
+            "still" for ImageClip backgrounds (gradient, frozen short video),
+            "video" for a VideoFileClip that ffmpeg can loop itself,
+            "slideshow" for a photo slideshow ffmpeg can concat from the photos,
+            None when the clip only exists inside MoviePy
+        """
+        if isinstance(background, ImageClip):
+            return "still"
+        if getattr(background, 'photo_sources', None):
+            return "slideshow"
+        filename = getattr(background, 'filename', None)
+        if filename and os.path.exists(filename):
+            return "video"
+        return None
+
+    def _render_with_ffmpeg(
+        self,
+        background,
+        overlay_layers: List[Tuple[np.ndarray, Tuple[int, int], float, float]],
+        audio_path: Path,
+        duration: float,
+        output_path: Path,
+        work_dir: Path
+    ):
+        """
+        Composite and encode the reel in one ffmpeg process.
+
+        The background is scaled/cropped (and looped) by ffmpeg, each overlay
+        is a PNG input shown only during its scene via overlay's enable=,
+        and the mixed WAV is muxed in the same pass - no frames go through Python.
+        A photo slideshow is cut from the source photos with ffmpeg's concat filter.
+        Temp PNGs go in work_dir, which generate_reel removes as a whole.
+        """
+        fill = (
+            f"scale={self.width}:{self.height}:force_original_aspect_ratio=increase,"
+            f"crop={self.width}:{self.height},setsar=1,fps={self.fps}"
+        )
+        # Background input(s), ending in the [v0] label
+        background_kind = self._ffmpeg_background_input(background)
+        if background_kind == "slideshow":
+            inputs = []
+            filters = []
+            for i, (photo, landscape) in enumerate(background.photo_sources):
+                inputs += [
+                    '-loop', '1', '-framerate', str(self.fps),
+                    '-t', f"{background.photo_duration:.3f}", '-i', str(photo)
+                ]
+                # Same rotate + stretch as the PIL path in _build_slideshow_clip
+                rotate = "transpose=cclock," if landscape else ""
+                filters.append(f"[{i}:v]{rotate}scale={self.width}:{self.height},setsar=1[p{i}]")
+            # Black after the last photo, like the MoviePy composite
+            filters.append(
+                ''.join(f"[p{i}]" for i in range(len(background.photo_sources)))
+                + f"concat=n={len(background.photo_sources)}:v=1:a=0,"
+                f"fps={self.fps},tpad=stop=-1:color=black[v0]"
             )
-            
-            temp_img = Path("output") / f"temp_{scene}_{timestamp}.png"
-            text_img.save(temp_img)
-            
-            # Use OLD working syntax from your original code
-            clip = ImageClip(str(temp_img), duration=seg['duration'])
-            clip = clip.with_start(current_time)
-            text_clips.append(clip)
-            
-            logger.info(f"   {scene}: {current_time:.2f}s → {current_time + seg['duration']:.2f}s")
-            current_time += seg['duration']
-
-        # Add attribution watermark (ONLY for Pexels - required by their API terms)
-        # Videvo is free with no attribution requirement
-        if bg_path and bg_path != "gradient" and isinstance(bg_path, str) and "pexels" in bg_path.lower():
-            attribution_clip = self._create_attribution_watermark("Pexels", final_duration)
-            text_clips.append(attribution_clip)
-            logger.info(f"✅ Added attribution: Pexels")
         else:
-            logger.info("No attribution needed (not Pexels)")
+            if background_kind == "still":
+                bg_png = work_dir / "bg.png"
+                Image.fromarray(background.img).save(bg_png, compress_level=1)
+                inputs = ['-loop', '1', '-framerate', str(self.fps), '-i', str(bg_png)]
+            else:
+                inputs = ['-stream_loop', '-1', '-i', background.filename]
+            filters = [f"[0:v]{fill}[v0]"]
+        first_overlay = len(background.photo_sources) if background_kind == "slideshow" else 1
+
+        # Overlay inputs are just the text boxes, so both the PNG encode
+        # and ffmpeg's per-frame blend only touch the text area
+        # (a single-image input keeps its last frame)
+        placed_layers = []
+        for box, (x, y), start, layer_duration in overlay_layers:
+            if not box[:, :, 3].any():
+                continue
+            overlay_png = work_dir / f"overlay{len(placed_layers)}.png"
+            Image.fromarray(box).save(overlay_png, compress_level=1)
+            inputs += ['-i', str(overlay_png)]
+            placed_layers.append((x, y, start, start + layer_duration))
+
+        audio_index = first_overlay + len(placed_layers)
+        inputs += ['-i', str(audio_path)]
+
+        # Stack overlays on the background in their time windows
+        for i, (x, y, start, end) in enumerate(placed_layers, start=1):
+            filters.append(
+                f"[v{i-1}][{first_overlay + i - 1}:v]"
+                f"overlay={x}:{y}:enable='gte(t,{start:.3f})*lt(t,{end:.3f})'[v{i}]"
+            )
+        filters.append(f"[v{len(placed_layers)}]format=yuv420p[vout]")
+
+        cmd = [
+            FFMPEG_BINARY, '-hide_banner', '-loglevel', 'error', '-y',
+            *inputs,
+            '-filter_complex', ';'.join(filters),
+            '-map', '[vout]', '-map', f'{audio_index}:a',
+            '-t', f"{duration:.3f}",
+            '-c:v', self._h264_codec, '-preset', self._encoder_preset,
+            '-b:v', '8000k', '-threads', str(os.cpu_count()),
+            '-c:a', 'aac',
+            *self._encoder_args(still=background_kind == "still"),
+            str(output_path)
+        ]
+        subprocess.run(cmd, check=True, capture_output=True)
+        logger.info("✅ Rendered with ffmpeg filter graph")
+
+    def _render_preview(
+        self,
+        background,
+        overlay_layers: List[Tuple[np.ndarray, Tuple[int, int], float, float]],
+        duration: float,
+        output_path: Path
+    ):
+        """
+        Write a silent animated WebP with one composited frame per scene.
 
-        # STEP 6: COMPOSITE
-        logger.info("\nSTEP 5: Compositing...")
+        The overlays only change at layer boundaries, so each span between
+        them becomes a single frame shown for that long - no motion search
+        or per-frame encode.
+        """
+        cuts = sorted({0.0, duration} | {
+            min(max(t, 0.0), duration)
+            for _, _, start, layer_duration in overlay_layers
+            for t in (start, start + layer_duration)
+        })
+
+        frames = []
+        frame_ms = []
+        for start, end in zip(cuts, cuts[1:]):
+            if end - start < 0.001:
+                continue
+            # Past the end of a short background, show black like the encoders
+            if background.duration is None or start < background.duration:
+                frame = Image.fromarray(background.get_frame(start)).convert('RGBA')
+                if frame.size != (self.width, self.height):
+                    frame = frame.resize((self.width, self.height))
+            else:
+                frame = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 255))
+            for box, (x, y), layer_start, layer_duration in overlay_layers:
+                if layer_start <= start < layer_start + layer_duration and box[:, :, 3].any():
+                    frame.alpha_composite(Image.fromarray(box), dest=(x, y))
+            frames.append(frame.convert('RGB'))
+            frame_ms.append(int(round((end - start) * 1000)))
+
+        frames[0].save(
+            output_path, save_all=True, append_images=frames[1:],
+            duration=frame_ms, loop=0, method=0
+        )
+        logger.info(f"✅ Rendered preview: {len(frames)} frames")
+
+    def _blend_overlays(
+        self,
+        background,
+        overlay_layers: List[Tuple[np.ndarray, Tuple[int, int], float, float]],
+        duration: float
+    ) -> object:
+        """
+        Build a clip that alpha-blends static overlays onto the background.
+
+        Each overlay is only its text box, pre-multiplied once; per frame
+        only that box is blended for the layers active at t. Over a still
+        background the result only changes at scene boundaries, so each
+        combination of active layers is blended once and reused; over a
+        moving background the blend writes into one reused output frame and
+        per-layer scratch buffers instead of allocating new arrays per frame.
+        """
+        layers = []
+        for box, (x, y), start, layer_duration in overlay_layers:
+            if not box[:, :, 3].any():
+                continue
+            box = box.astype(np.float32)
+            alpha = box[:, :, 3:] / 255.0
+            layers.append((
+                start, start + layer_duration,
+                (slice(y, y + box.shape[0]), slice(x, x + box.shape[1])),
+                box[:, :, :3] * alpha,  # pre-multiplied color
+                1.0 - alpha,
+                np.empty(box.shape[:2] + (3,), dtype=np.float32)  # blend scratch
+            ))
 
-        final = CompositeVideoClip([background] + text_clips)
-        final = final.with_audio(AudioFileClip(str(final_audio)))
-        final = final.with_duration(final_duration)
+        # Past the end of a short background, show black like CompositeVideoClip
+        black = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        # Still backgrounds: blended frame per tuple of active layer indices
+        still_frames = {} if isinstance(background, ImageClip) else None
+        # Moving backgrounds: the writer consumes each frame before asking for
+        # the next, so one output buffer can be overwritten every frame
+        frame_buffer = np.empty((self.height, self.width, 3), dtype=np.uint8)
+
+        def frame_function(t):
+            active = tuple(i for i, layer in enumerate(layers) if layer[0] <= t < layer[1])
+            if still_frames is not None and active in still_frames:
+                return still_frames[active]
+            if background.duration is None or t < background.duration:
+                frame = background.get_frame(t)
+            else:
+                frame = black
+            if active:
+                # Never write into a cached background frame
+                if still_frames is None:
+                    np.copyto(frame_buffer, frame)
+                    frame = frame_buffer
+                else:
+                    frame = frame.copy()
+                for i in active:
+                    _, _, region, premultiplied, inverse_alpha, scratch = layers[i]
+                    np.multiply(frame[region], inverse_alpha, out=scratch)
+                    scratch += premultiplied
+                    frame[region] = scratch  # unsafe cast truncates like astype
+            if still_frames is not None:
+                still_frames[active] = frame
+            return frame
+
+        return VideoClip(frame_function, duration=duration)
+
+    def _render_with_moviepy(
+        self,
+        background,
+        overlay_layers: List[Tuple[np.ndarray, Tuple[int, int], float, float]],
+        audio_path: Path,
+        duration: float,
+        output_path: Path
+    ):
+        """Composite and encode the reel frame by frame with MoviePy."""
+        text_clips = []
+        if tuple(background.size) == (self.width, self.height):
+            # Blend only each overlay's visible box with precomputed alpha,
+            # instead of CompositeVideoClip blitting full frames per layer
+            final = self._blend_overlays(background, overlay_layers, duration)
+        else:
+            # Hand the RGBA pixels to MoviePy directly (no PNG round-trip)
+            text_clips = [
+                ImageClip(box, duration=layer_duration, transparent=True)
+                .with_start(start)
+                .with_position(position)
+                for box, position, start, layer_duration in overlay_layers
+                if box[:, :, 3].any()
+            ]
+            final = CompositeVideoClip([background] + text_clips)
+            final = final.with_duration(duration)
 
-        # STEP 7: EXPORT
-        logger.info("\nSTEP 6: Exporting...")
-        
+        # Mux the mixed WAV straight into the encode (no MoviePy audio pass)
         final.write_videofile(
             str(output_path),
             fps=self.fps,
-            codec='libx264',
+            codec=self._h264_codec,
+            audio=str(audio_path),
             audio_codec='aac',
-            temp_audiofile='temp-audio.m4a',
-            remove_temp=True,
-            preset='medium',
-            bitrate='8000k'
+            preset=self._encoder_preset,
+            bitrate='8000k',
+            threads=os.cpu_count(),
+            ffmpeg_params=self._encoder_args(still=isinstance(background, ImageClip))
         )
 
-        # Cleanup
-        for seg in audio_segments.values():
-            Path(seg['path']).unlink(missing_ok=True)
-        
-        for scene in ["hook", "meaning", "action", "cta"]:
-            Path(f"output/temp_{scene}_{timestamp}.png").unlink(missing_ok=True)
-        
-        final_audio.unlink(missing_ok=True)
-
         for clip in text_clips:
             clip.close()
-        background.close()
         final.close()
 
-        logger.info("\n" + "="*70)
-        logger.info("✅ VIDEO COMPLETE - EXTREME VARIETY MODE")
-        logger.info("="*70)
-        logger.info(f"Output: {output_path}")
-        logger.info(f"Style: {selected_style['name']}")
-        logger.info(f"Font: {selected_style['font_primary']}")
-        logger.info(f"Text Position: {selected_style['text_position']}")
-        logger.info(f"Color: {text_color_key} ({selected_style['colors'][text_color_key]})")
-        logger.info(f"Duration: {final_duration:.2f}s")
-        logger.info("="*70 + "\n")
-
-        return str(output_path)
-
-    def _add_music(self, voiceover_path: Path, output_path: Path, duration: float):
-        """Add background music."""
-        import shutil
+    def _add_music(self, voice: AudioSegment, output_path: Path):
+        """
+        Add background music and write the mixed track as WAV.
 
-        music_dir = Path("music")
-        
-        if not music_dir.exists() or not list(music_dir.glob("*.mp3")):
+        The mix is exactly as long as `voice`, which generate_reel has
+        already padded/trimmed to the reel length.
+        """
+        if not self._music_files:
             logger.warning("No music")
-            shutil.copy(voiceover_path, output_path)
+            voice.export(str(output_path), format='wav')
             return
 
-        music_files = list(music_dir.glob("*.mp3"))
-        music_file = random.choice(music_files)
+        music_file = random.choice(self._music_files)
         logger.info(f"🎵 Music: {music_file.name}")
 
         try:
-            voice = AudioSegment.from_file(str(voiceover_path))
-            music = AudioSegment.from_file(str(music_file))
-
-            music = music - 14
-            
-            voice_ms = len(voice)
-            
-            if len(music) > voice_ms:
-                music = music[:voice_ms]
-            else:
-                loops = (voice_ms // len(music)) + 1
-                music = music * loops
-                music = music[:voice_ms]
-
-            mixed = music.overlay(voice)
-            mixed.export(str(output_path), format='mp3', bitrate='192k')
+            # One ffmpeg pass: loop the music, duck it 14 dB, sum it under the
+            # voice and stop when the voice track ends. Mono is copied to both
+            # channels at full level (ffmpeg's default upmix is -3 dB) and
+            # normalize=0 keeps levels identical to a plain overlay.
+            to_stereo = 'pan=stereo|FL=FC+FL|FR=FC+FR'
+            subprocess.run(
+                [
+                    FFMPEG_BINARY, '-hide_banner', '-loglevel', 'error', '-y',
+                    *_pcm_args(voice), '-i', 'pipe:0',
+                    '-stream_loop', '-1', '-i', str(music_file),
+                    '-filter_complex',
+                    f'[0:a]{to_stereo}[voice];'
+                    f'[1:a]{to_stereo},volume=-14dB[music];'
+                    '[voice][music]amix=inputs=2:duration=first:dropout_transition=0:normalize=0',
+                    '-ac', '2', '-ar', '44100', '-c:a', 'pcm_s16le',
+                    str(output_path)
+                ],
+                input=voice.raw_data,
+                check=True,
+                capture_output=True
+            )
             
             logger.info("✅ Mixed with music")
 
         except Exception as e:
             logger.error(f"Music failed: {e}")
-            shutil.copy(voiceover_path, output_path)
+            voice.export(str(output_path), format='wav')
 
 
 def main():
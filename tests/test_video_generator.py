@@ -0,0 +1,288 @@
+"""
+Unit tests for The17Project video generation helpers.
+
+Tests cover:
+- Style/background history persistence
+- Tempo change and music mixing
+- Text overlay disk cache
+- Photo slideshow cut list
+- Overlay blending on the MoviePy path
+- Animated WebP preview
+"""
+
+# Import os module to build file paths
+import os
+# Import json module to inspect the saved history file
+import json
+# Import gc and weakref to check that histories can be freed
+import gc
+import weakref
+# Import pytest for test framework functionality and assertions
+import pytest
+# Import patch to replace the TTS/background clients with test doubles
+from unittest.mock import patch
+# Import numpy to compare rendered overlay arrays
+import numpy as np
+
+# Import modules to test - these are our actual application modules
+import sys
+# Insert the src directory into Python path so we can import our modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# Import the StyleHistory class that tracks recently used styles
+from video_generator import StyleHistory, VideoGenerator, _atempo
+# Import AudioSegment to build voice/music fixtures
+from pydub import AudioSegment
+
+
+class TestStyleHistory:
+    """Test cases for StyleHistory class."""
+
+    def test_add_style_defers_write_until_flush(self, tmp_path):
+        """Test that history is only written to disk on flush()."""
+        # Point the history at a file that doesn't exist yet
+        state_file = tmp_path / "history.json"
+        history = StyleHistory(state_file)
+
+        # Record a style and a background
+        history.add_style("style_1")
+        history.add_background("bg_1")
+
+        # Nothing should be written until flush is called
+        assert not state_file.exists()
+
+        # Flush once and verify both entries were persisted
+        history.flush()
+        data = json.loads(state_file.read_text())
+        assert data["recent_styles"] == ["style_1"]
+        assert data["recent_backgrounds"] == ["bg_1"]
+
+    def test_flush_without_changes_does_not_write(self, tmp_path):
+        """Test that flush() is a no-op when nothing changed."""
+        # Create history with no recorded usage
+        state_file = tmp_path / "history.json"
+        history = StyleHistory(state_file)
+
+        # Flushing a clean history should not create the file
+        history.flush()
+        assert not state_file.exists()
+
+    def test_corrupt_history_starts_fresh(self, tmp_path):
+        """Test that a truncated history file doesn't break the next run."""
+        # Simulate a write that was cut off halfway
+        state_file = tmp_path / "history.json"
+        state_file.write_text('{"recent_styles": ["sty')
+        history = StyleHistory(state_file)
+        assert history.recent_styles == []
+
+        # The next flush replaces it with valid JSON
+        history.add_style("style_1")
+        history.flush()
+        assert json.loads(state_file.read_text())["recent_styles"] == ["style_1"]
+
+    def test_discarded_history_is_not_kept_alive(self, tmp_path):
+        """Test that the exit-time flush hook doesn't pin old histories in memory."""
+        history = StyleHistory(tmp_path / "history.json")
+        ref = weakref.ref(history)
+
+        # Dropping the last reference must free it
+        del history
+        gc.collect()
+        assert ref() is None
+
+
+class TestAudioMixing:
+    """Test cases for the ffmpeg audio helpers."""
+
+    def test_atempo_shortens_audio(self):
+        """Test that a 2x tempo change halves the length and keeps the format."""
+        voice = AudioSegment.silent(duration=2000, frame_rate=24000)
+        sped_up = _atempo(voice, 2.0)
+
+        # Same sample format, half the length (allow a few ms of filter padding)
+        assert sped_up.frame_rate == 24000
+        assert sped_up.channels == 1
+        assert abs(len(sped_up) - 1000) <= 30
+
+    # Patch the external clients so no credentials are needed
+    @patch('video_generator.BackgroundManager')
+    @patch('video_generator.AudioGenerator')
+    def test_music_mix_matches_voice_length(self, mock_audio, mock_bg, tmp_path, monkeypatch):
+        """Test that the mix is stereo 44.1 kHz and exactly as long as the voice."""
+        # Run inside a temp dir so output/ folders are created there
+        monkeypatch.chdir(tmp_path)
+        generator = VideoGenerator()
+
+        # Music shorter than the voice, so it has to loop
+        music_path = tmp_path / "music.wav"
+        AudioSegment.silent(duration=700, frame_rate=44100).export(str(music_path), format="wav")
+        generator._music_files = [music_path]
+
+        # Mono 24 kHz voice, like the TTS output
+        voice = AudioSegment.silent(duration=1500, frame_rate=24000)
+        output_path = tmp_path / "mixed.wav"
+        generator._add_music(voice, output_path)
+
+        mixed = AudioSegment.from_wav(str(output_path))
+        assert mixed.channels == 2
+        assert mixed.frame_rate == 44100
+        assert abs(len(mixed) - 1500) <= 30
+
+
+class TestOverlayCache:
+    """Test cases for the text overlay disk cache."""
+
+    # Patch the external clients so no credentials are needed
+    @patch('video_generator.BackgroundManager')
+    @patch('video_generator.AudioGenerator')
+    def test_cached_overlay_matches_fresh_render(self, mock_audio, mock_bg, tmp_path, monkeypatch):
+        """Test that a cache hit returns the same pixels without re-rendering."""
+        # Run inside a temp dir so output/ folders are created there
+        monkeypatch.chdir(tmp_path)
+        # Create the generator with mocked clients
+        generator = VideoGenerator()
+        # Pick the first style and its first palette color
+        style = next(iter(generator.visual_styles.values()))
+        color_key = next(iter(style['colors']))
+
+        # First call renders and writes the cache file
+        first_box, first_pos = generator._get_text_overlay("Follow for guidance", style, color_key, "cta")
+        assert len(list(generator.overlay_cache_dir.glob("*.npz"))) == 1
+
+        # Second call must not touch PIL at all and return identical pixels
+        with patch.object(generator, '_create_text_overlay') as mock_render:
+            second_box, second_pos = generator._get_text_overlay("Follow for guidance", style, color_key, "cta")
+            mock_render.assert_not_called()
+        assert np.array_equal(first_box, second_box)
+        # The box must land at the same spot in the frame
+        assert first_pos == second_pos
+
+    # Patch the external clients so no credentials are needed
+    @patch('video_generator.BackgroundManager')
+    @patch('video_generator.AudioGenerator')
+    def test_fallback_font_render_is_not_cached(self, mock_audio, mock_bg, tmp_path, monkeypatch):
+        """Test that a render with a missing style font never lands in the cache."""
+        # Run inside a temp dir so output/ folders are created there
+        monkeypatch.chdir(tmp_path)
+        generator = VideoGenerator()
+        # Point a copy of the first style at a font file that doesn't exist
+        style = dict(next(iter(generator.visual_styles.values())))
+        generator.fonts = dict(generator.fonts, Missing={'path': 'fonts/Missing.ttf', 'sizes': {'cta': 60}})
+        style['font_primary'] = 'Missing'
+        color_key = next(iter(style['colors']))
+
+        # The DejaVu fallback still renders, but nothing is written
+        box, _ = generator._get_text_overlay("Follow for guidance", style, color_key, "cta")
+        assert box[:, :, 3].any()
+        assert list(generator.overlay_cache_dir.glob("*.npz")) == []
+
+
+class TestPhotoSlideshow:
+    """Test cases for the photo slideshow background."""
+
+    # Patch the external clients so no credentials are needed
+    @patch('video_generator.BackgroundManager')
+    @patch('video_generator.AudioGenerator')
+    def test_slideshow_reads_only_photo_headers(self, mock_audio, mock_bg, tmp_path, monkeypatch):
+        """Test that the slideshow keeps a cut list and decodes nothing up front."""
+        # Run inside a temp dir so output/ folders are created there
+        monkeypatch.chdir(tmp_path)
+        generator = VideoGenerator()
+        from PIL import Image
+
+        # One landscape and two portrait photos
+        photos = []
+        for i, size in enumerate([(300, 200), (200, 300), (200, 300)]):
+            path = tmp_path / f"photo_{i}.jpg"
+            Image.new('RGB', size, (i * 40, 0, 0)).save(path)
+            photos.append(path)
+
+        # 1s at 0.5s per photo needs only the first two
+        with patch.object(Image.Image, 'load', side_effect=AssertionError("decoded")):
+            slideshow = generator._create_photo_slideshow(photos, 1.0)
+        assert slideshow.photo_sources == [(photos[0], True), (photos[1], False)]
+        assert slideshow.duration == 1.0
+
+        # The MoviePy clip is built on demand at full reel size
+        clip = generator._build_slideshow_clip(slideshow)
+        assert clip.get_frame(0.75).shape == (generator.height, generator.width, 3)
+
+
+class TestBlendOverlays:
+    """Test cases for the MoviePy-path overlay blending."""
+
+    # Patch the external clients so no credentials are needed
+    @patch('video_generator.BackgroundManager')
+    @patch('video_generator.AudioGenerator')
+    def test_still_background_blends_each_scene_once(self, mock_audio, mock_bg, tmp_path, monkeypatch):
+        """Test that a still background reuses the blended frame within a scene."""
+        # Run inside a temp dir so output/ folders are created there
+        monkeypatch.chdir(tmp_path)
+        generator = VideoGenerator()
+        from video_generator import ImageClip
+
+        # Gray still background and a half-transparent white 10x10 box
+        background = ImageClip(np.full((generator.height, generator.width, 3), 100, dtype=np.uint8), duration=2.0)
+        box = np.full((10, 10, 4), 255, dtype=np.uint8)
+        box[:, :, 3] = 128
+        clip = generator._blend_overlays(background, [(box, (5, 5), 0.0, 1.0)], 2.0)
+
+        # Two frames inside the scene are the same cached array
+        first = clip.get_frame(0.1)
+        assert clip.get_frame(0.5) is first
+        # The box is blended and the rest of the frame is untouched
+        assert first[5, 5, 0] == int(100 * (1 - 128 / 255) + 255 * 128 / 255)
+        assert first[0, 0, 0] == 100
+        # After the scene ends the plain background comes back
+        assert clip.get_frame(1.5)[5, 5, 0] == 100
+
+
+class TestRenderPreview:
+    """Test cases for the animated WebP preview."""
+
+    # Patch the external clients so no credentials are needed
+    @patch('video_generator.BackgroundManager')
+    @patch('video_generator.AudioGenerator')
+    def test_preview_has_one_frame_per_scene(self, mock_audio, mock_bg, tmp_path, monkeypatch):
+        """Test that each overlay span becomes one frame with its own duration."""
+        # Run inside a temp dir so output/ folders are created there
+        monkeypatch.chdir(tmp_path)
+        generator = VideoGenerator()
+        from video_generator import ImageClip
+        from PIL import Image
+
+        # Two back-to-back scenes over a still background
+        background = ImageClip(np.zeros((generator.height, generator.width, 3), dtype=np.uint8), duration=3.0)
+        box = np.full((10, 10, 4), 255, dtype=np.uint8)
+        layers = [(box, (0, 0), 0.0, 1.0), (box, (20, 20), 1.0, 2.0)]
+        output_path = tmp_path / "preview.webp"
+        generator._render_preview(background, layers, 3.0, output_path)
+
+        # One frame per scene, each shown for the scene's length
+        with Image.open(output_path) as preview:
+            assert preview.n_frames == 2
+            preview.seek(1)
+            # WebP frame info is only filled in once the frame is decoded
+            preview.load()
+            assert preview.info["duration"] == 2000
+
+    # Patch the external clients so no credentials are needed
+    @patch('video_generator.BackgroundManager')
+    @patch('video_generator.AudioGenerator')
+    def test_preview_style_pick_is_not_recorded(self, mock_audio, mock_bg, tmp_path, monkeypatch):
+        """Test that a preview's style choice leaves the rotation history alone."""
+        # Run inside a temp dir so output/ folders are created there
+        monkeypatch.chdir(tmp_path)
+        generator = VideoGenerator()
+
+        # Previews select without recording; nothing is pending for flush()
+        generator._select_style(record=False)
+        assert generator.style_history.recent_styles == []
+        generator.style_history.flush()
+        assert not generator.style_history.state_file.exists()
+
+
+# This allows running the tests directly with python test_video_generator.py
+if __name__ == "__main__":
+    # Run tests with pytest in verbose mode to see detailed output
+    pytest.main([__file__, "-v"])